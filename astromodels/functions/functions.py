@@ -2,11 +2,11 @@ from __future__ import division
 
 import math
 import warnings
+from functools import lru_cache
 
 import astropy.units as astropy_units
 import numpy as np
 import six
-from past.utils import old_div
 from scipy.special import erfcinv, gamma, gammaincc
 from typing import Iterable
 
@@ -34,6 +34,94 @@ __author__ = 'giacomov'
 
 erg2keV = 6.24151e8
 
+_LN10SQ = math.log(10.0) ** 2
+
+
+# A small cache of np.log(x) keyed on the identity of the input array. During
+# a fit, or within a composite model, the same x array is evaluated over and
+# over by several components each needing log(x); computing it once and
+# sharing it removes one transcendental pass per component. The cache holds
+# strong references, so an id cannot be recycled while its entry is alive.
+# A hit additionally checks the first and last elements, so a caller that
+# rewrites a reused buffer in place gets a fresh log rather than a stale one
+# (mutations that leave both endpoints untouched still defeat this, but a
+# full content check would cost as much as the log itself).
+
+_LOG_CACHE_SIZE = 2
+
+_log_cache = []
+
+
+def _cached_log(x):
+
+    if x.size == 0:
+
+        return np.log(x)
+
+    first = x.flat[0]
+    last = x.flat[-1]
+
+    for cached_x, cached_first, cached_last, cached_logx in _log_cache:
+
+        if cached_x is x and cached_first == first and cached_last == last:
+
+            return cached_logx
+
+    logx = np.log(x)
+
+    _log_cache.append((x, first, last, logx))
+
+    if len(_log_cache) > _LOG_CACHE_SIZE:
+
+        _log_cache.pop(0)
+
+    return logx
+
+
+@lru_cache(maxsize=1024)
+def _gamma2p(a):
+
+    # gamma(2 + a) cached on the photon index: during a fit only Ec moves on
+    # most steps of the analytical normalization in Band_Calderone, so the
+    # gamma function would be recomputed with the same argument over and over
+
+    return gamma(2.0 + a)
+
+
+def _get_impl(instance, x):
+    """
+    Select between the _evaluate_np and _evaluate_q implementations of a
+    function based on the concrete type of x. The choice is cached on the
+    instance, so after the first call the per-evaluation cost is one dict
+    lookup instead of an isinstance check (which walks the MRO) - a small
+    but measurable saving over the 10^5+ calls of a typical fit.
+    """
+
+    try:
+
+        cache = instance._impl_cache
+
+    except AttributeError:
+
+        cache = instance._impl_cache = {}
+
+    impl = cache.get(x.__class__)
+
+    if impl is None:
+
+        # Store the plain function (not the bound method) so the cache stays
+        # trivially copyable and picklable
+
+        impl = (
+            instance.__class__._evaluate_q
+            if isinstance(x, astropy_units.Quantity)
+            else instance.__class__._evaluate_np
+        )
+
+        cache[x.__class__] = impl
+
+    return impl
+
 
 class GSLNotAvailable(ImportWarning):
     pass
@@ -188,24 +276,35 @@ class Powerlaw(Function1D, metaclass=FunctionMeta):
 
         self.K.unit = y_unit
 
+        # Cached so that the Quantity path does not have to go through the
+        # y_unit property on every call
+
+        self._y_unit_cache = y_unit
+
     # noinspection PyPep8Naming
     def evaluate(self, x, K, piv, index):
 
-        if isinstance(x, astropy_units.Quantity):
-            index_ = index.value
-            K_ = K.value
-            piv_ = piv.value
-            x_ = x.value
+        impl = _get_impl(self, x)
 
-            unit_ = self.y_unit
+        return impl(self, x, K, piv, index)
 
-        else:
-            unit_ = 1.0
-            K_, piv_, x_, index_ = K, piv, x, index
+    def _evaluate_np(self, x, K, piv, index):
 
-        result = nb_func.plaw_eval(x_, K_, index_, piv_)
+        if x.size >= nb_func.PARALLEL_THRESHOLD:
 
-        return result * unit_
+            return nb_func.plaw_eval_par(x, K, index, piv)
+
+        if index == int(index) and abs(index) <= 3:
+
+            return nb_func.plaw_int_eval(x, K, int(index), piv)
+
+        return nb_func.plaw_eval(x, K, index, piv)
+
+    def _evaluate_q(self, x, K, piv, index):
+
+        result = nb_func.plaw_eval(x.value, K.value, index.value, piv.value)
+
+        return result * self._y_unit_cache
 
 
 # noinspection PyPep8Naming
@@ -266,11 +365,27 @@ class Powerlaw_flux(Function1D, metaclass=FunctionMeta):
         self.a.unit = x_unit
         self.b.unit = x_unit
 
+        self._y_unit_cache = y_unit
+
     # noinspection PyPep8Naming
     def evaluate(self, x, F, index, a, b):
-        gp1 = index + 1
 
-        return F * gp1 / (b ** gp1 - a ** gp1) * np.power(x, index)
+        if isinstance(x, astropy_units.Quantity):
+            F_ = F.value
+            index_ = index.value
+            a_ = a.value
+            b_ = b.value
+            x_ = x.value
+
+            unit_ = self._y_unit_cache
+
+        else:
+            unit_ = 1.0
+            F_, index_, a_, b_, x_ = F, index, a, b, x
+
+        result = nb_func.plaw_flux_eval(x_, F_, index_, a_, b_)
+
+        return result * unit_
 
 
 class Cutoff_powerlaw(Function1D, metaclass=FunctionMeta):
@@ -328,25 +443,30 @@ class Cutoff_powerlaw(Function1D, metaclass=FunctionMeta):
 
         self.K.unit = y_unit
 
-    # noinspectionq PyPep8Naming
+        self._y_unit_cache = y_unit
+
+    # noinspection PyPep8Naming
     def evaluate(self, x, K, piv, index, xc):
 
-        if isinstance(x, astropy_units.Quantity):
-            index_ = index.value
-            K_ = K.value
-            piv_ = piv.value
-            xc_ = xc.value
-            x_ = x.value
+        impl = _get_impl(self, x)
 
-            unit_ = self.y_unit
+        return impl(self, x, K, piv, index, xc)
 
-        else:
-            unit_ = 1.0
-            K_, piv_, x_, index_, xc_ = K, piv, x, index, xc
+    def _evaluate_np(self, x, K, piv, index, xc):
 
-        result = nb_func.cplaw_eval(x_, K_, xc_, index_, piv_)
+        if x.size >= nb_func.PARALLEL_THRESHOLD:
 
-        return result * unit_
+            return nb_func.cplaw_eval_par(x, K, xc, index, piv)
+
+        return nb_func.cplaw_eval_logx(x, _cached_log(x), K, xc, index, piv)
+
+    def _evaluate_q(self, x, K, piv, index, xc):
+
+        result = nb_func.cplaw_eval(
+            x.value, K.value, xc.value, index.value, piv.value
+        )
+
+        return result * self._y_unit_cache
 
 
 class Inverse_cutoff_powerlaw(Function1D, metaclass=FunctionMeta):
@@ -390,25 +510,30 @@ class Inverse_cutoff_powerlaw(Function1D, metaclass=FunctionMeta):
 
         self.K.unit = y_unit
 
-    # noinspectionq PyPep8Naming
+        self._y_unit_cache = y_unit
+
+    # noinspection PyPep8Naming
     def evaluate(self, x, K, piv, index, b):
 
-        if isinstance(x, astropy_units.Quantity):
-            index_ = index.value
-            K_ = K.value
-            piv_ = piv.value
-            b_ = b.value
-            x_ = x.value
+        impl = _get_impl(self, x)
 
-            unit_ = self.y_unit
+        return impl(self, x, K, piv, index, b)
 
-        else:
-            unit_ = 1.0
-            K_, piv_, x_, index_, b_ = K, piv, x, index, b
+    def _evaluate_np(self, x, K, piv, index, b):
 
-        result = nb_func.cplaw_inverse_eval(x_, K_, b_, index_, piv_)
+        if x.size >= nb_func.PARALLEL_THRESHOLD:
 
-        return result * unit_
+            return nb_func.cplaw_inverse_eval_par(x, K, b, index, piv)
+
+        return nb_func.cplaw_inverse_eval(x, K, b, index, piv)
+
+    def _evaluate_q(self, x, K, piv, index, b):
+
+        result = nb_func.cplaw_inverse_eval(
+            x.value, K.value, b.value, index.value, piv.value
+        )
+
+        return result * self._y_unit_cache
 
 
 class Super_cutoff_powerlaw(Function1D, metaclass=FunctionMeta):
@@ -483,11 +608,30 @@ class Super_cutoff_powerlaw(Function1D, metaclass=FunctionMeta):
 
             unit_ = self.y_unit
 
+            # x.value is a fresh view object on every call, so the
+            # identity-keyed log cache can never hit here and would only
+            # get churned by it
+
+            logx_ = np.log(x_)
+
         else:
             unit_ = 1.0
             K_, piv_, x_, index_, xc_, gamma_ = K, piv, x, index, xc, gamma
 
-        result = nb_func.super_cplaw_eval(x_, K_, piv_, index_, xc_, gamma_)
+            logx_ = _cached_log(x_)
+
+        if gamma_ == 1.0:
+
+            # The cutoff is a plain exponential, so we can use the cheaper
+            # kernel which avoids the pow in the exponent
+
+            result = nb_func.cplaw_eval_logx(x_, logx_, K_, xc_, index_, piv_)
+
+        else:
+
+            result = nb_func.scplaw_eval_logx(
+                x_, logx_, K_, xc_, index_, gamma_, piv_
+            )
 
         return result * unit_
 
@@ -587,7 +731,7 @@ class SmoothlyBrokenPowerLaw(Function1D, metaclass=FunctionMeta):
             )
 
         result = nb_func.sbplaw_eval(
-            x_, K_, alpha_, break_energy, break_scale_, beta_, pivot_
+            x_, K_, alpha_, break_energy_, break_scale_, beta_, pivot_
         )
 
         return result * unit_
@@ -652,27 +796,26 @@ class Broken_powerlaw(Function1D, metaclass=FunctionMeta):
 
     # noinspection PyPep8Naming
     def evaluate(self, x, K, xb, alpha, beta, piv):
-        # The K * 0 is to keep the units right. If the input has unit, this will make a result
-        # array with the same units as K. If the input has no units, this will have no
-        # effect whatsoever
 
-        if isinstance(x, astropy_units.Quantity):
-            alpha_ = alpha.value
-            beta_ = alpha.value
-            K_ = K.value
-            xb_ = xb.value
-            piv_ = piv.value
-            x_ = x.value
+        impl = _get_impl(self, x)
 
-            unit_ = self.y_unit
+        return impl(self, x, K, xb, alpha, beta, piv)
 
-        else:
-            unit_ = 1.0
-            alpha_, beta_, K_, piv_, x_, xb_ = alpha, beta, K, piv, x, xb
+    def _evaluate_np(self, x, K, xb, alpha, beta, piv):
 
-        result = nb_func.bplaw_eval(x_, K_, xb_, alpha_, beta_, piv_)
+        if x.size >= nb_func.PARALLEL_THRESHOLD:
 
-        return result * unit_
+            return nb_func.bplaw_eval_par(x, K, xb, alpha, beta, piv)
+
+        return nb_func.bplaw_eval(x, K, xb, alpha, beta, piv)
+
+    def _evaluate_q(self, x, K, xb, alpha, beta, piv):
+
+        result = nb_func.bplaw_eval(
+            x.value, K.value, xb.value, alpha.value, beta.value, piv.value
+        )
+
+        return result * self.y_unit
 
 
 class StepFunction(Function1D, metaclass=FunctionMeta):
@@ -716,14 +859,21 @@ class StepFunction(Function1D, metaclass=FunctionMeta):
         self.value.unit = y_unit
 
     def evaluate(self, x, lower_bound, upper_bound, value):
-        # The value * 0 is to keep the units right
 
-        result = np.zeros(x.shape) * value * 0
+        if isinstance(x, astropy_units.Quantity):
+
+            # A typed zeros array carries the units through without the
+            # extra elementwise multiply of the old "0.0 * value" trick
+
+            out = astropy_units.Quantity(
+                np.zeros(x.shape), value.unit, copy=False
+            )
 
-        idx = (x >= lower_bound) & (x <= upper_bound)
-        result[idx] = value
+            out[(x >= lower_bound) & (x <= upper_bound)] = value
 
-        return result
+            return out
+
+        return nb_func.step_eval(x, lower_bound, upper_bound, value)
 
 
 class StepFunctionUpper(Function1D, metaclass=FunctionMeta):
@@ -769,14 +919,21 @@ class StepFunctionUpper(Function1D, metaclass=FunctionMeta):
         self.value.unit = y_unit
 
     def evaluate(self, x, lower_bound, upper_bound, value):
-        # The value * 0 is to keep the units right
 
-        result = np.zeros(x.shape) * value * 0
+        if isinstance(x, astropy_units.Quantity):
+
+            # A typed zeros array carries the units through without the
+            # extra elementwise multiply of the old "0.0 * value" trick
+
+            out = astropy_units.Quantity(
+                np.zeros(x.shape), value.unit, copy=False
+            )
+
+            out[(x >= lower_bound) & (x < upper_bound)] = value
 
-        idx = (x >= lower_bound) & (x < upper_bound)
-        result[idx] = value
+            return out
 
-        return result
+        return nb_func.step_eval_upper(x, lower_bound, upper_bound, value)
 
 
 # noinspection PyPep8Naming
@@ -806,7 +963,7 @@ class Blackbody(Function1D, metaclass=FunctionMeta):
 
     def _set_units(self, x_unit, y_unit):
         # The normalization has the same units as y
-        self.K.unit = old_div(y_unit, (x_unit ** 2))
+        self.K.unit = y_unit / (x_unit ** 2)
 
         # The break point has always the same dimension as the x variable
         self.kT.unit = x_unit
@@ -815,24 +972,9 @@ class Blackbody(Function1D, metaclass=FunctionMeta):
 
         if isinstance(x, astropy_units.Quantity):
 
-            K_ = K.value
-            kT_ = kT.value
-
-            x_ = x.value
+            return nb_func.bb_eval(x.value, K.value, kT.value) * self.y_unit
 
-            unit_ = self.y_unit
-
-        else:
-            unit_ = 1.0
-            K_, kT_, x_, = (
-                K,
-                kT,
-                x,
-            )
-
-        result = nb_func.bb_eval(x_, K_, kT_)
-
-        return result * unit_
+        return nb_func.bb_eval(x, K, kT)
 
 
 # noinspection PyPep8Naming
@@ -888,7 +1030,20 @@ class Sin(Function1D, metaclass=FunctionMeta):
 
     # noinspection PyPep8Naming
     def evaluate(self, x, K, f, phi):
-        return K * np.sin(2 * np.pi * f * x + phi)
+
+        if isinstance(x, astropy_units.Quantity):
+
+            return K * np.sin(2 * np.pi * f * x + phi)
+
+        # Chain the ufuncs in place on the output array, so only one
+        # intermediate is ever allocated (Quantity does not support out=)
+
+        out = np.multiply(2 * np.pi * f, x)
+        out += phi
+        np.sin(out, out=out)
+        out *= K
+
+        return out
 
 
 class Constant(Function1D, metaclass=FunctionMeta):
@@ -912,8 +1067,15 @@ class Constant(Function1D, metaclass=FunctionMeta):
         self.k.unit = y_unit
 
     def evaluate(self, x, k):
-        
-        return k * np.ones(np.shape(x))
+
+        if isinstance(k, astropy_units.Quantity):
+
+            return k * np.ones(np.shape(x))
+
+        # np.full writes the constant directly, without the extra
+        # multiplication pass over the ones array
+
+        return np.full(np.shape(x), k)
 
 
 class Line(Function1D, metaclass=FunctionMeta):
@@ -946,7 +1108,15 @@ class Line(Function1D, metaclass=FunctionMeta):
         self.b.unit = y_unit / x_unit
 
     def evaluate(self, x, a, b):
-        return b * x + a
+
+        if isinstance(x, astropy_units.Quantity):
+
+            return b * x + a
+
+        out = np.multiply(b, x)
+        out += a
+
+        return out
 
 
 class Quadratic(Function1D, metaclass=FunctionMeta):
@@ -1136,7 +1306,20 @@ class DiracDelta(Function1D, metaclass=FunctionMeta):
 
     def evaluate(self, x, value, zero_point):
 
-        out = np.zeros(x.shape) * value * 0
+        if isinstance(x, astropy_units.Quantity):
+
+            # A typed zeros array carries the units through without the
+            # extra elementwise multiply of the old "0.0 * value" trick
+
+            out = astropy_units.Quantity(
+                np.zeros(x.shape), value.unit, copy=False
+            )
+
+            out[x == zero_point] = value
+
+            return out
+
+        out = np.zeros(np.shape(x))
 
         out[x == zero_point] = value
 
@@ -1177,6 +1360,13 @@ if has_naima:
                 fix : yes
         """
 
+        def _setup(self):
+
+            # Cache for the naima model object, see evaluate()
+
+            self._synch_cache = None
+            self._synch_key = None
+
         def _set_units(self, x_unit, y_unit):
 
             # This function can only be used as a spectrum,
@@ -1225,8 +1415,8 @@ if has_naima:
             # so we need to create a wrapper which will remove the unit from x and add the unit to the return
             # value
 
-            self._particle_distribution_wrapper = lambda x: old_div(
-                function(x.value), current_units.energy
+            self._particle_distribution_wrapper = (
+                lambda x: function(x.value) / current_units.energy
             )
 
         def get_particle_distribution(self):
@@ -1267,14 +1457,35 @@ if has_naima:
                 x, B, distance, emin, emax
             )
 
-            _synch = naima.models.Synchrotron(
-                self._particle_distribution_wrapper,
-                B,
-                Eemin=emin,
-                Eemax=emax,
-                nEed=need,
+            # Building the naima model is expensive, so reuse it for as long
+            # as the inputs it depends on do not change (typical during a
+            # fit, where emin, emax and need are fixed). Changes in the
+            # particle distribution parameters do not invalidate the cache
+            # because flux() re-evaluates the wrapper at call time, and a new
+            # particle distribution produces a new wrapper object.
+
+            key = (
+                id(self._particle_distribution_wrapper),
+                float(B.value),
+                float(emin.value),
+                float(emax.value),
+                int(need),
             )
 
+            if key != self._synch_key:
+
+                self._synch_cache = naima.models.Synchrotron(
+                    self._particle_distribution_wrapper,
+                    B,
+                    Eemin=emin,
+                    Eemax=emax,
+                    nEed=need,
+                )
+
+                self._synch_key = key
+
+            _synch = self._synch_cache
+
             if has_units:
                 return _synch.flux(x, distance=distance)
             else:
@@ -1317,7 +1528,7 @@ class _ComplexTestFunction(Function1D, metaclass=FunctionMeta):
     def _set_units(self, x_unit, y_unit):
 
         self.A.unit = y_unit
-        self.B.unit = old_div(y_unit, x_unit)
+        self.B.unit = y_unit / x_unit
 
     def set_particle_distribution(self, function):
 
@@ -1408,26 +1619,34 @@ class Band(Function1D, metaclass=FunctionMeta):
         self.beta.unit = astropy_units.dimensionless_unscaled
 
     def evaluate(self, x, K, alpha, xp, beta, piv):
-        E0 = old_div(xp, (2 + alpha))
 
         if alpha < beta:
             raise ModelAssertionViolation("Alpha cannot be less than beta")
 
-        if isinstance(x, astropy_units.Quantity):
-            alpha_ = alpha.value
-            beta_ = alpha.value
-            K_ = K.value
-            E0_ = E0.value
-            piv_ = piv.value
-            x_ = x.value
+        if x.__class__ is np.ndarray:
 
-            unit_ = self.y_unit
+            # Fast path for the fit loop: a bare array goes straight to the
+            # kernel, with no unit bookkeeping
 
-        else:
-            unit_ = 1.0
-            alpha_, beta_, K_, piv_, x_, E0_ = alpha, beta, K, piv, x, E0
+            E0 = xp / (2 + alpha)
+
+            if x.size >= nb_func.PARALLEL_THRESHOLD:
+
+                return nb_func.band_eval_par(x, K, alpha, beta, E0, piv)
+
+            return nb_func.band_eval(x, K, alpha, beta, E0, piv)
+
+        return self._evaluate_quantity(x, K, alpha, xp, beta, piv)
+
+    def _evaluate_quantity(self, x, K, alpha, xp, beta, piv):
+
+        E0 = xp / (2 + alpha)
+
+        result = nb_func.band_eval(
+            x.value, K.value, alpha.value, beta.value, E0.value, piv.value
+        )
 
-        return nb_func.band_eval(x_, K_, alpha_, beta_, E0_, piv_) * unit_
+        return result * self.y_unit
 
 
 class Band_grbm(Function1D, metaclass=FunctionMeta):
@@ -1491,25 +1710,24 @@ class Band_grbm(Function1D, metaclass=FunctionMeta):
         if alpha < beta:
             raise ModelAssertionViolation("Alpha cannot be less than beta")
 
-        idx = x < (alpha - beta) * xc
+        # This is the same function as Band, just parametrized with the
+        # cutoff energy instead of the peak energy, so we can reuse its kernel
 
-        # The K * 0 part is a trick so that out will have the right units (if the input
-        # has units)
+        if isinstance(x, astropy_units.Quantity):
+            alpha_ = alpha.value
+            beta_ = beta.value
+            K_ = K.value
+            xc_ = xc.value
+            piv_ = piv.value
+            x_ = x.value
 
-        out = np.zeros(x.shape) * K * 0
+            unit_ = self.y_unit
 
-        out[idx] = (
-            K * np.power(old_div(x[idx], piv), alpha) *
-            np.exp(old_div(-x[idx], xc))
-        )
-        out[~idx] = (
-            K
-            * np.power((alpha - beta) * xc / piv, alpha - beta)
-            * np.exp(beta - alpha)
-            * np.power(old_div(x[~idx], piv), beta)
-        )
+        else:
+            unit_ = 1.0
+            alpha_, beta_, K_, piv_, x_, xc_ = alpha, beta, K, piv, x, xc
 
-        return out
+        return nb_func.band_eval(x_, K_, alpha_, beta_, xc_, piv_) * unit_
 
 
 class Band_Calderone(Function1D, metaclass=FunctionMeta):
@@ -1597,8 +1815,11 @@ class Band_Calderone(Function1D, metaclass=FunctionMeta):
     def ggrb_int_cpl(a, Ec, Emin, Emax):
 
         # Gammaincc does not support quantities
-        i1 = gammaincc(2 + a, old_div(Emin, Ec)) * gamma(2 + a)
-        i2 = gammaincc(2 + a, old_div(Emax, Ec)) * gamma(2 + a)
+
+        g = _gamma2p(float(a))
+
+        i1 = gammaincc(2 + a, Emin / Ec) * g
+        i2 = gammaincc(2 + a, Emax / Ec) * g
 
         return -Ec * Ec * (i2 - i1)
 
@@ -1616,11 +1837,11 @@ class Band_Calderone(Function1D, metaclass=FunctionMeta):
 
         if alpha == -2:
 
-            Ec = old_div(xp, 0.0001)  # TRICK: avoid a=-2
+            Ec = xp / 0.0001  # TRICK: avoid a=-2
 
         else:
 
-            Ec = old_div(xp, (2 + alpha))
+            Ec = xp / (2 + alpha)
 
         # Split energy
 
@@ -1674,20 +1895,35 @@ class Band_Calderone(Function1D, metaclass=FunctionMeta):
 
         norm = F * erg2keV / (intflux * unit_)
 
+        if isinstance(norm, astropy_units.Quantity):
+
+            # The kernels do not support units, so evaluate with K = 1 and
+            # attach the (dimensional) normalization afterwards
+
+            K_ = 1.0
+
+        else:
+
+            # Folding the normalization into K saves one full pass over the
+            # output array
+
+            K_ = norm
+
         if opt == 0:
 
             # Cutoff power law
 
-            flux = nb_func.cplaw_eval(x_, 1.0, Ec_, alpha_, Ec_)
-
-            # flux = norm * np.power(old_div(x, Ec), alpha) * \
-            #     np.exp(old_div(- x, Ec))
+            flux = nb_func.cplaw_eval(x_, K_, Ec_, alpha_, Ec_)
 
         else:
 
-            # The norm * 0 is to keep the units right
+            # Band model
+
+            flux = nb_func.band_eval(x_, K_, alpha_, beta_, Ec_, Ec_)
 
-            flux = nb_func.band_eval(x_, 1.0, alpha_, beta_, Ec_, Ec_)
+        if K_ is norm:
+
+            return flux
 
         return norm * flux
 
@@ -1745,7 +1981,13 @@ class Log_parabola(Function1D, metaclass=FunctionMeta):
 
     def evaluate(self, x, K, piv, alpha, beta):
 
-        # print("Receiving %s" % ([K, piv, alpha, beta]))
+        if not isinstance(x, astropy_units.Quantity):
+
+            if x.size >= nb_func.PARALLEL_THRESHOLD:
+
+                return nb_func.logpar_eval_par(x, K, piv, alpha, beta)
+
+            return nb_func.logpar_eval(x, K, piv, alpha, beta)
 
         xx = np.divide(x, piv)
 
@@ -1774,10 +2016,10 @@ class Log_parabola(Function1D, metaclass=FunctionMeta):
 
         # Eq. 6 in Massaro et al. 2004
         # (http://adsabs.harvard.edu/abs/2004A%26A...413..489M)
+        # 10**((2+alpha)*ln10 / (2*beta)) written as a single exp
 
-        return self.piv.value * pow(
-            10, old_div(((2 + self.alpha.value) * np.log(10)),
-                        (2 * self.beta.value))
+        return self.piv.value * math.exp(
+            (2.0 + self.alpha.value) * _LN10SQ / (2.0 * self.beta.value)
         )
 
 
@@ -1840,17 +2082,35 @@ if has_gsl:
             ap1 = index + 1
 
             def integrand(x):
-                return -pow(ec, ap1) * gamma_inc(ap1, old_div(x, ec))
+                return -pow(ec, ap1) * gamma_inc(ap1, x / ec)
 
             return integrand(b) - integrand(a)
 
         def evaluate(self, x, F, index, xc, a, b):
-            this_integral = self._integral(a, b, index, xc)
 
-            return (
-                F / this_integral *
-                np.power(x, index) * np.exp(-1 * np.divide(x, xc))
-            )
+            if isinstance(x, astropy_units.Quantity):
+
+                this_integral = self._integral(a, b, index, xc)
+
+            else:
+
+                # a and b are fixed, so across a fit only index and xc move
+                # (and repeat, e.g. in MCMC): the two incomplete-gamma
+                # evaluations are worth caching
+
+                this_integral = _cpl_flux_integral(
+                    float(a), float(b), float(index), float(xc)
+                )
+
+            # ** with a scalar exponent takes the specialized power path,
+            # and the divide becomes a multiply by the reciprocal
+
+            return F / this_integral * x ** index * np.exp(x * (-1.0 / xc))
+
+    @lru_cache(maxsize=4096)
+    def _cpl_flux_integral(a, b, index, ec):
+
+        return Cutoff_powerlaw_flux._integral(a, b, index, ec)
 
 
 class Exponential_cutoff(Function1D, metaclass=FunctionMeta):
@@ -1885,7 +2145,14 @@ class Exponential_cutoff(Function1D, metaclass=FunctionMeta):
         self.xc.unit = x_unit
 
     def evaluate(self, x, K, xc):
-        return K * np.exp(np.divide(x, -xc))
+
+        if isinstance(x, astropy_units.Quantity):
+
+            result = nb_func.expcut_eval(x.value, K.value, xc.value)
+
+            return result * self.y_unit
+
+        return nb_func.expcut_eval(x, K, xc)
 
 
 if has_ebltable:
@@ -1920,11 +2187,48 @@ if has_ebltable:
             # define EBL model, use dominguez as default
             self._tau = ebltau.OptDepth.readmodel(model="dominguez")
 
+            # Cache for the optical depth, which only depends on the redshift
+            # and on the energy grid: during a fit both stay the same from
+            # iteration to iteration, while evaluate is called at every step
+
+            self._tau_cache = None
+
         def set_ebl_model(self, modelname):
 
             # passing modelname to ebltable, which will check if defined
             self._tau = ebltau.OptDepth.readmodel(model=modelname)
 
+            self._tau_cache = None
+
+        def _opt_depth(self, z, x, eTeV):
+
+            # Keyed on the identity of x with a cheap content fingerprint
+            # (as in _cached_log), so a reused buffer rewritten in place
+            # cannot return a stale optical depth
+
+            if not isinstance(eTeV, np.ndarray) or eTeV.size == 0:
+
+                return self._tau.opt_depth(z, eTeV)
+
+            fingerprint = (eTeV.size, eTeV.flat[0], eTeV.flat[-1])
+
+            cache = self._tau_cache
+
+            if (
+                cache is not None
+                and cache[0] == z
+                and cache[1] is x
+                and cache[2] == fingerprint
+            ):
+
+                return cache[3]
+
+            tau = self._tau.opt_depth(z, eTeV)
+
+            self._tau_cache = (z, x, fingerprint, tau)
+
+            return tau
+
         def _set_units(self, x_unit, y_unit):
 
             if not hasattr(x_unit, "physical_type") or x_unit.physical_type != "energy":
@@ -1953,13 +2257,55 @@ if has_ebltable:
 
                 # ebltable expects TeV
                 eTeV = x.to(astropy_units.TeV).value
+
+                tau = self._opt_depth(redshift.value, x, eTeV)
+
                 return (
-                    np.exp(-self._tau.opt_depth(redshift.value, eTeV) * attenuation)
+                    np.exp(-tau * attenuation)
                     * astropy_units.dimensionless_unscaled
                 )
 
             else:
 
                 # otherwise it's in keV
-                eTeV = old_div(x, 1e9)
-                return np.exp(-self._tau.opt_depth(redshift, eTeV) * attenuation)
+                eTeV = x * 1e-9
+
+                tau = self._opt_depth(redshift, x, eTeV)
+
+                # tau is shared with the cache, so the product allocates the
+                # output array and the exp then runs in place on it
+
+                out = tau * (-attenuation)
+
+                return np.exp(out, out=out)
+
+        def evaluate_batch(self, x_list, redshifts, attenuation=1.0):
+            """
+            Evaluate the attenuation for several sources in one call, for
+            joint fits of a population seen through the same EBL model. The
+            optical depths are computed per source, but the exponential runs
+            once on the concatenated depths, amortizing the per-call
+            overhead.
+
+            :param x_list: list of energy arrays (in keV), one per source
+            :param redshifts: redshifts of the sources, one per energy array
+            :param attenuation: scaling factor for the strength of the
+                attenuation (default: 1.0)
+            :return: list of attenuation arrays, one per source
+            """
+
+            # Goes straight to ebltable instead of through _opt_depth, so
+            # the single-slot cache is not churned by the per-source loop
+
+            taus = [
+                self._tau.opt_depth(z, x * 1e-9)
+                for x, z in zip(x_list, redshifts)
+            ]
+
+            stacked = np.concatenate(taus) * (-attenuation)
+
+            np.exp(stacked, out=stacked)
+
+            return np.split(
+                stacked, np.cumsum([x.size for x in x_list])[:-1]
+            )
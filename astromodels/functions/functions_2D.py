@@ -1,16 +1,67 @@
 from __future__ import division
-from past.utils import old_div
 import numpy as np
 from astropy.coordinates import SkyCoord, ICRS, BaseCoordinateFrame
 from astropy.io import fits
 from astropy import wcs
+from astropy.wcs.utils import wcs_to_celestial_frame
 import astropy.units as u
+from scipy.ndimage import map_coordinates
 
+import astromodels.functions.numba_functions as nb_func
 from astromodels.functions.function import Function2D, FunctionMeta
-from astromodels.utils.angular_distance import angular_distance
+from astromodels.utils.angular_distance import (angular_distance,
+                                                angular_distance_fast)
 from astromodels.utils.vincenty import vincenty
+from astromodels.utils.sky_bbox import sky_bounding_box
 
 import hashlib
+from functools import lru_cache
+
+# scalar constants hoisted out of the evaluate methods
+
+_DEG2RAD = np.pi / 180.0
+_RAD2DEG2 = (180.0 / np.pi) ** 2
+
+
+def _as_float_array(arr):
+    """
+    Return arr as an at-least-1d floating array for the numba kernels,
+    preserving float32 input (so single-precision grids, e.g. HEALPix tiles,
+    evaluate and return in single precision) and converting everything else
+    to float64.
+    """
+
+    arr = np.atleast_1d(np.asarray(arr))
+
+    if arr.dtype == np.float32 or arr.dtype == np.float64:
+
+        return arr
+
+    return arr.astype(np.float64)
+
+
+def _focus_angular_distance(lon_f, lat_f, lon_rad, lat_rad, coslat):
+    """
+    Haversine distance (in degrees) between one point (lon_f, lat_f, in
+    degrees) and a set of points already converted to radians, with their
+    cos(lat) precomputed, so that several calls (e.g. one per ellipse focus)
+    can share the conversion and trig of the large array.
+
+    :param lon_f: float, longitude of the single point, in degrees
+    :param lat_f: float, latitude of the single point, in degrees
+    :param lon_rad: array, longitudes of the other points, in radians
+    :param lat_rad: array, latitudes of the other points, in radians
+    :param coslat: array, cosine of lat_rad
+    :return: angular distance(s) in degrees
+    """
+
+    lon_f = np.deg2rad(lon_f)
+    lat_f = np.deg2rad(lat_f)
+
+    a = np.sin(0.5 * (lat_rad - lat_f)) ** 2 + \
+        np.cos(lat_f) * coslat * np.sin(0.5 * (lon_rad - lon_f)) ** 2
+
+    return np.rad2deg(2.0 * np.arcsin(np.sqrt(a)))
 
 
 class Latitude_galactic_diffuse(Function2D, metaclass=FunctionMeta):
@@ -52,6 +103,8 @@ class Latitude_galactic_diffuse(Function2D, metaclass=FunctionMeta):
 
         self._frame = ICRS()
 
+        self._update_rotation_matrix()
+
     def set_frame(self, new_frame):
         """
         Set a new frame for the coordinates (the default is ICRS J2000)
@@ -63,6 +116,27 @@ class Latitude_galactic_diffuse(Function2D, metaclass=FunctionMeta):
 
         self._frame = new_frame
 
+        self._update_rotation_matrix()
+
+    def _update_rotation_matrix(self):
+
+        # The frame is fixed between calls, so we can precompute the rotation
+        # to galactic once and avoid building a SkyCoord (unit bookkeeping,
+        # frame broadcasting) for every pixel grid passed to evaluate.
+        # The columns of the matrix are the cartesian axes of self._frame
+        # expressed in galactic coordinates, so R @ v rotates a direction
+        # from self._frame to galactic.
+
+        axes = SkyCoord(
+            x=[1.0, 0.0, 0.0],
+            y=[0.0, 1.0, 0.0],
+            z=[0.0, 0.0, 1.0],
+            frame=self._frame,
+            representation_type="cartesian",
+        ).transform_to("galactic")
+
+        self._rot_matrix = axes.cartesian.xyz.value
+
     def _set_units(self, x_unit, y_unit, z_unit):
 
         self.K.unit = z_unit
@@ -73,12 +147,34 @@ class Latitude_galactic_diffuse(Function2D, metaclass=FunctionMeta):
     def evaluate(self, x, y, K, sigma_b, l_min, l_max):
 
         # We assume x and y are R.A. and Dec
-        _coord = SkyCoord(ra=x, dec=y, frame=self._frame, unit="deg")
 
-        b = _coord.transform_to('galactic').b.value
-        l = _coord.transform_to('galactic').l.value
+        if isinstance(x, u.Quantity):
+
+            x = x.to(u.degree).value
+            y = y.to(u.degree).value
+
+        lon = np.deg2rad(x)
+        lat = np.deg2rad(y)
+
+        clat = np.cos(lat)
+
+        # Unit vectors rotated to galactic through the cached matrix; this
+        # replaces the SkyCoord construction and double transform_to of the
+        # previous implementation
+
+        vec = np.array(
+            [clat * np.cos(lon), clat * np.sin(lon), np.sin(lat)]
+        )
+
+        # flatten the stacked components so the rotation also accepts N-d
+        # coordinate grids, like the SkyCoord path it replaced
+
+        gx, gy, gz = (self._rot_matrix @ vec.reshape(3, -1)).reshape(vec.shape)
 
-        return K * np.exp(old_div(-b ** 2, (2 * sigma_b ** 2))) * np.logical_or(np.logical_and(l > l_min, l < l_max),np.logical_and(l_min > l_max, np.logical_or(l > l_min, l < l_max)))
+        b = np.rad2deg(np.arcsin(np.clip(gz, -1.0, 1.0)))
+        l = np.rad2deg(np.arctan2(gy, gx)) % 360.0
+
+        return K * np.exp(-b ** 2 / (2 * sigma_b ** 2)) * np.logical_or(np.logical_and(l > l_min, l < l_max),np.logical_and(l_min > l_max, np.logical_or(l > l_min, l < l_max)))
 
     def get_boundaries(self):
 
@@ -112,7 +208,7 @@ class Latitude_galactic_diffuse(Function2D, metaclass=FunctionMeta):
 
         if isinstance( z, u.Quantity):
             z = z.value
-        return integral * np.power( 180. / np.pi, -2 ) * np.ones_like( z )
+        return integral / _RAD2DEG2 * np.ones_like( z )
         
 
 class Gaussian_on_sphere(Function2D, metaclass=FunctionMeta):
@@ -160,44 +256,34 @@ class Gaussian_on_sphere(Function2D, metaclass=FunctionMeta):
 
     def evaluate(self, x, y, lon0, lat0, sigma):
 
-        lon, lat = x,y
-
-        angsep = angular_distance(lon0, lat0, lon, lat)
-
-        s2 = sigma**2
-
-        return (old_div(180, np.pi))**2 * 1 / (2.0 * np.pi * s2) * np.exp(-0.5 * angsep**2/s2)
+        if not isinstance(x, u.Quantity):
 
-    def get_boundaries(self):
+            # single fused pass over the pixels instead of one numpy
+            # temporary per trigonometric step
 
-        # Truncate the gaussian at 2 times the max of sigma allowed
+            lon = _as_float_array(x)
+            lat = _as_float_array(y)
 
-        max_sigma = self.sigma.max_value
+            return nb_func.gauss_on_sphere_eval(
+                lon.ravel(), lat.ravel(), lon0, lat0, sigma
+            ).reshape(lon.shape)
 
-        min_lat = max(-90., self.lat0.value - 2 * max_sigma)
-        max_lat = min(90., self.lat0.value + 2 * max_sigma)
-
-        max_abs_lat = max(np.absolute(min_lat), np.absolute(max_lat))
-
-        if max_abs_lat > 89. or 2 * max_sigma / np.cos(max_abs_lat * np.pi / 180.) >= 180.:
-
-            min_lon = 0.
-            max_lon = 360.
+        lon, lat = x,y
 
-        else:
+        # the source is far from the antipodes of the grid, so the faster
+        # haversine formula is accurate enough
 
-            min_lon = self.lon0.value - 2 * max_sigma / np.cos(max_abs_lat * np.pi / 180.)
-            max_lon = self.lon0.value + 2 * max_sigma / np.cos(max_abs_lat * np.pi / 180.)
+        angsep = angular_distance_fast(lon0, lat0, lon, lat)
 
-            if min_lon < 0.:
+        s2 = sigma**2
 
-                min_lon = min_lon + 360.
+        return _RAD2DEG2 / (2.0 * np.pi * s2) * np.exp(-0.5 * angsep**2/s2)
 
-            elif max_lon > 360.:
+    def get_boundaries(self):
 
-                max_lon = max_lon - 360.
+        # Truncate the gaussian at 2 times the max of sigma allowed
 
-        return (min_lon, max_lon), (min_lat, max_lat)
+        return sky_bounding_box(self.lon0.value, self.lat0.value, 2 * self.sigma.max_value)
 
     def get_total_spatial_integral(self, z=None):  
         """
@@ -296,49 +382,34 @@ class Asymm_Gaussian_on_sphere(Function2D, metaclass=FunctionMeta):
         else:
             phi = theta + 90.
 
-        cos2_phi = np.power( np.cos( phi * np.pi/180.), 2)
-        sin2_phi = np.power( np.sin( phi * np.pi/180.), 2)
-        
-        sin_2phi = np.sin( 2. * phi * np.pi/180.)
-        
-        A = old_div(cos2_phi, (2.*b**2)) + old_div(sin2_phi, (2.*a**2))
+        # one sin and one cos of phi; squares and the double angle follow
+        # from the identities instead of three more transcendentals
 
-        B = old_div(- sin_2phi, (4.*b**2)) + old_div(sin_2phi, (4.*a**2))
+        phi_rad = phi * np.pi/180.
 
-        C = old_div(sin2_phi, (2.*b**2)) + old_div(cos2_phi, (2.*a**2))
+        cos_phi = np.cos( phi_rad )
+        sin_phi = np.sin( phi_rad )
 
-        E = -A*np.power(dX, 2) + 2.*B*dX*dY - C*np.power(dY, 2)
+        cos2_phi = cos_phi * cos_phi
+        sin2_phi = sin_phi * sin_phi
 
-        return np.power(old_div(180, np.pi), 2) * 1. / (2 * np.pi * a * b) * np.exp( E )
+        sin_2phi = 2. * sin_phi * cos_phi
         
-    def get_boundaries(self):
-
-        # Truncate the gaussian at 2 times the max of sigma allowed
-
-        min_lat = max(-90., self.lat0.value - 2 * self.a.max_value)
-        max_lat = min(90., self.lat0.value + 2 * self.a.max_value)
-
-        max_abs_lat = max(np.absolute(min_lat), np.absolute(max_lat))
+        A = cos2_phi / (2.*b**2) + sin2_phi / (2.*a**2)
 
-        if max_abs_lat > 89. or 2 * self.a.max_value / np.cos(max_abs_lat * np.pi / 180.) >= 180.:
+        B = -sin_2phi / (4.*b**2) + sin_2phi / (4.*a**2)
 
-            min_lon = 0.
-            max_lon = 360.
+        C = sin2_phi / (2.*b**2) + cos2_phi / (2.*a**2)
 
-        else:
-
-            min_lon = self.lon0.value - 2 * self.a.max_value / np.cos(max_abs_lat * np.pi / 180.)
-            max_lon = self.lon0.value + 2 * self.a.max_value / np.cos(max_abs_lat * np.pi / 180.)
-
-            if min_lon < 0.:
-
-                min_lon = min_lon + 360.
+        E = -A*np.power(dX, 2) + 2.*B*dX*dY - C*np.power(dY, 2)
 
-            elif max_lon > 360.:
+        return _RAD2DEG2 / (2 * np.pi * a * b) * np.exp( E )
+        
+    def get_boundaries(self):
 
-                max_lon = max_lon - 360.
+        # Truncate the gaussian at 2 times the max of sigma allowed
 
-        return (min_lon, max_lon), (min_lat, max_lat)
+        return sky_bounding_box(self.lon0.value, self.lat0.value, 2 * self.a.max_value)
 
     def get_total_spatial_integral(self, z=None):  
         """
@@ -398,42 +469,60 @@ class Disk_on_sphere(Function2D, metaclass=FunctionMeta):
 
     def evaluate(self, x, y, lon0, lat0, radius):
 
-        lon, lat = x,y
+        if not isinstance(x, u.Quantity):
 
-        angsep = angular_distance(lon0, lat0, lon, lat)
+            lon = _as_float_array(x)
+            lat = _as_float_array(y)
 
-        return np.power(old_div(180, np.pi), 2) * 1. / (np.pi * radius ** 2) * (angsep <= radius)
+            norm = _RAD2DEG2 / (np.pi * radius ** 2)
 
-    def get_boundaries(self):
+            return nb_func.disk_on_sphere_eval(
+                lon.ravel(), lat.ravel(), lon0, lat0, radius, norm
+            ).reshape(lon.shape)
 
-        # Truncate the disk at 2 times the max of radius allowed
+        lon, lat = np.atleast_1d(x), np.atleast_1d(y)
 
-        max_radius = self.radius.max_value
+        # Most of an ROI grid is usually far away from a small disk, so a
+        # cheap bounding-box cut selects the pixels worth the trigonometry
+        # and everything else stays at zero. The cut works on plain degree
+        # values: angle Quantities cannot enter the wrap-around arithmetic
+        # with bare floats below.
 
-        min_lat = max(-90., self.lat0.value - 2 * max_radius)
-        max_lat = min(90., self.lat0.value + 2 * max_radius)
+        lon_v = lon.value
+        lat_v = lat.value
+        lon0_v = getattr(lon0, "value", lon0)
+        lat0_v = getattr(lat0, "value", lat0)
+        radius_v = getattr(radius, "value", radius)
 
-        max_abs_lat = max(np.absolute(min_lat), np.absolute(max_lat))
+        dlat = np.abs(lat_v - lat0_v)
 
-        if max_abs_lat > 89. or 2 * max_radius / np.cos(max_abs_lat * np.pi / 180.) >= 180.:
+        mask = dlat <= radius_v
 
-            min_lon = 0.
-            max_lon = 360.
+        # The longitude cut is loosened by dlat so that it can never reject
+        # a pixel inside the disk; it is skipped altogether when the disk
+        # contains a pole, where every longitude can be inside.
 
-        else:
+        if abs(lat0_v) + radius_v < 90.:
 
-            min_lon = self.lon0.value - 2 * max_radius / np.cos(max_abs_lat * np.pi / 180.)
-            max_lon = self.lon0.value + 2 * max_radius / np.cos(max_abs_lat * np.pi / 180.)
+            dlon = np.abs((np.abs(lon_v - lon0_v) + 180.) % 360. - 180.)
 
-            if min_lon < 0.:
+            mask &= dlon * np.cos(np.deg2rad(lat0_v)) <= radius_v + dlat
 
-                min_lon = min_lon + 360.
+        inside = np.zeros(lon.shape, dtype=bool)
 
-            elif max_lon > 360.:
+        if np.any(mask):
 
-                max_lon = max_lon - 360.
+            angsep = angular_distance_fast(lon0_v, lat0_v, lon_v[mask], lat_v[mask])
 
-        return (min_lon, max_lon), (min_lat, max_lat)
+            inside[mask] = angsep <= radius_v
+
+        return _RAD2DEG2 / (np.pi * radius ** 2) * inside
+
+    def get_boundaries(self):
+
+        # Truncate the disk at 2 times the max of radius allowed
+
+        return sky_bounding_box(self.lon0.value, self.lat0.value, 2 * self.radius.max_value)
 
     def get_total_spatial_integral(self, z=None):  
         """
@@ -500,6 +589,16 @@ class Ellipse_on_sphere(Function2D, metaclass=FunctionMeta):
     lat2 = None
     focal_pts = False
 
+    # parameter tuple the current focal points were computed for
+    _fp_key = None
+
+    # opt-in fast path: treat the neighbourhood of the center as a tangent
+    # plane and test the rotated (dx, dy) offsets directly, instead of
+    # computing two great-circle distances per pixel. Good to a fraction of
+    # a pixel for small ellipses away from the poles; off by default since
+    # it can move boundary pixels of large or high-latitude ellipses.
+    use_planar_approx = False
+
     def _set_units(self, x_unit, y_unit, z_unit):
 
         # lon0 and lat0 have most probably all units of degrees.
@@ -532,52 +631,89 @@ class Ellipse_on_sphere(Function2D, metaclass=FunctionMeta):
     def evaluate(self, x, y, lon0, lat0, a, e, theta):
         
         b = a * np.sqrt(1. - e**2)
-        
-        # calculate focal points
-        
-        self.lon1, self.lat1, self.lon2, self.lat2 = self.calc_focal_pts(lon0, lat0, a, b, theta)
-        self.focal_pts = True
-        
-        # lon/lat of point in question
-        lon, lat = x, y
-        
-        # sum of geodesic distances to focii (should be <= 2a to be in ellipse)
-        angsep1 = angular_distance(self.lon1, self.lat1, lon, lat)
-        angsep2 = angular_distance(self.lon2, self.lat2, lon, lat)
-        angsep  = angsep1 + angsep2
-        
-        return np.power(old_div(180, np.pi), 2) * 1. / (np.pi * a * b) * (angsep <= 2*a)
 
-    def get_boundaries(self):
+        # the focal points only depend on the parameters, which stay fixed
+        # while evaluate is called for every pixel tile of an ROI, so only
+        # recompute them when the parameters actually moved
 
-        # Truncate the ellipse at 2 times the max of semimajor axis allowed
+        key = (
+            getattr(lon0, "value", lon0), getattr(lat0, "value", lat0),
+            getattr(a, "value", a), getattr(e, "value", e),
+            getattr(theta, "value", theta),
+        )
 
-        max_radius = self.a.max_value
+        if key != self._fp_key:
 
-        min_lat = max(-90., self.lat0.value - 2 * max_radius)
-        max_lat = min(90., self.lat0.value + 2 * max_radius)
+            # calculate focal points; they are always computed from (and
+            # stored as) plain degree floats, so the cache entry can be
+            # shared between units and unitless calls on the same instance
 
-        max_abs_lat = max(np.absolute(min_lat), np.absolute(max_lat))
+            lon0_v, lat0_v, a_v, e_v, theta_v = key
 
-        if max_abs_lat > 89. or 2 * max_radius / np.cos(max_abs_lat * np.pi / 180.) >= 180.:
+            b_v = a_v * np.sqrt(1. - e_v ** 2)
 
-            min_lon = 0.
-            max_lon = 360.
+            self.lon1, self.lat1, self.lon2, self.lat2 = self.calc_focal_pts(lon0_v, lat0_v, a_v, b_v, theta_v)
+            self.focal_pts = True
 
-        else:
+            self._fp_key = key
 
-            min_lon = self.lon0.value - 2 * max_radius / np.cos(max_abs_lat * np.pi / 180.)
-            max_lon = self.lon0.value + 2 * max_radius / np.cos(max_abs_lat * np.pi / 180.)
+        if not isinstance(x, u.Quantity):
 
-            if min_lon < 0.:
+            lon = _as_float_array(x)
+            lat = _as_float_array(y)
 
-                min_lon = min_lon + 360.
+            norm = _RAD2DEG2 / (np.pi * a * b)
 
-            elif max_lon > 360.:
+            if self.use_planar_approx:
 
-                max_lon = max_lon - 360.
+                theta_rad = np.deg2rad(theta)
+                ct = np.cos(theta_rad)
+                st = np.sin(theta_rad)
 
-        return (min_lon, max_lon), (min_lat, max_lat)
+                dlon = (lon - lon0 + 180.0) % 360.0 - 180.0
+                dx = dlon * np.cos(np.deg2rad(lat0))
+                dy = lat - lat0
+
+                along = ct * dx + st * dy
+                across = -st * dx + ct * dy
+
+                inside = (along / a) ** 2 + (across / b) ** 2 <= 1.0
+
+                return norm * inside
+
+            return nb_func.ellipse_on_sphere_eval(
+                lon.ravel(), lat.ravel(),
+                self.lon1, self.lat1, self.lon2, self.lat2,
+                2.0 * a, norm
+            ).reshape(lon.shape)
+
+        # lon/lat of point in question
+        lon, lat = x, y
+
+        # sum of geodesic distances to focii (should be <= 2a to be in ellipse);
+        # the two haversine evaluations share the radian conversion and the
+        # cos(lat) of the query points
+
+        lon_rad = np.deg2rad(lon)
+        lat_rad = np.deg2rad(lat)
+        coslat = np.cos(lat_rad)
+
+        # the stored focal points are plain degree floats; re-wrap them so
+        # the arithmetic below stays Quantity throughout
+
+        angsep1 = _focus_angular_distance(
+            self.lon1 * u.degree, self.lat1 * u.degree, lon_rad, lat_rad, coslat)
+        angsep2 = _focus_angular_distance(
+            self.lon2 * u.degree, self.lat2 * u.degree, lon_rad, lat_rad, coslat)
+        angsep  = angsep1 + angsep2
+        
+        return _RAD2DEG2 / (np.pi * a * b) * (angsep <= 2*a)
+
+    def get_boundaries(self):
+
+        # Truncate the ellipse at 2 times the max of semimajor axis allowed
+
+        return sky_bounding_box(self.lon0.value, self.lat0.value, 2 * self.a.max_value)
 
     def get_total_spatial_integral(self, z=None):  
         """
@@ -624,13 +760,14 @@ class SpatialTemplate_2D(Function2D, metaclass=FunctionMeta):
     # constructor provided by the meta class
     
     def _setup(self):
-        
+
         self._frame = "icrs"
         self._fitsfile = None
         self._map = None
+        self._wcs_frame = None
     
     
-    def load_file(self,fitsfile, ihdu=0):
+    def load_file(self,fitsfile, ihdu=0, dtype=np.float64):
         
         if fitsfile is None:
             
@@ -641,7 +778,23 @@ class SpatialTemplate_2D(Function2D, metaclass=FunctionMeta):
         with fits.open(self._fitsfile) as f:
     
             self._wcs = wcs.WCS( header = f[ihdu].header )
-            self._map = f[ihdu].data
+
+            #FITS data is big-endian; ndimage (and fast numpy paths in
+            #general) want a native-order contiguous array. Pass
+            #dtype=np.float32 to halve the memory and bandwidth of large
+            #templates where single precision is enough.
+            self._map = np.ascontiguousarray( f[ihdu].data, dtype=dtype )
+
+            #name of the celestial frame the map is stored in; when it matches
+            #self._frame, evaluate can convert to pixels through the WCS alone,
+            #without building a SkyCoord.
+            try:
+
+                self._wcs_frame = wcs_to_celestial_frame( self._wcs ).name
+
+            except ValueError:
+
+                self._wcs_frame = None
               
             self._nX = f[ihdu].header['NAXIS1']
             self._nY = f[ihdu].header['NAXIS2']
@@ -687,23 +840,33 @@ class SpatialTemplate_2D(Function2D, metaclass=FunctionMeta):
             
             self.load_file(self._fitsfile)
           
-        # We assume x and y are R.A. and Dec
-        coord = SkyCoord(ra=x, dec=y, frame=self._frame, unit="deg")
-        
-        #transform input coordinates to pixel coordinates; 
-        #SkyCoord takes care of necessary coordinate frame transformations.
-        Xpix, Ypix = coord.to_pixel(self._wcs)
+        if self._frame == self._wcs_frame and not isinstance(x, u.Quantity):
+
+            #the coordinates are already in the frame of the map, so the
+            #SkyCoord construction (frame machinery, unit bookkeeping) can be
+            #skipped in favor of a direct WCS conversion
+            Xpix, Ypix = self._wcs.all_world2pix(x, y, 0)
+
+        else:
+
+            # We assume x and y are R.A. and Dec
+            coord = SkyCoord(ra=x, dec=y, frame=self._frame, unit="deg")
+
+            #transform input coordinates to pixel coordinates;
+            #SkyCoord takes care of necessary coordinate frame transformations.
+            Xpix, Ypix = coord.to_pixel(self._wcs)
         
         Xpix = np.atleast_1d(Xpix.astype(int))
         Ypix = np.atleast_1d(Ypix.astype(int))
-        
-        # find pixels that are in the template ROI, otherwise return zero
-        #iz = np.where((Xpix<self._nX) & (Xpix>=0) & (Ypix<self._nY) & (Ypix>=0))[0]
-        iz = (Xpix<self._nX) & (Xpix>=0) & (Ypix<self._nY) & (Ypix>=0)
-        out = np.zeros_like(Xpix)
-        out[iz] = self._map[Ypix[iz], Xpix[iz]]
-        
-        return np.multiply(K,out)
+
+        #single C pass over the map with bounds handling (pixels outside the
+        #template get 0), replacing the boolean mask plus the fancy-indexed
+        #gather/scatter. order=0 on the truncated integer coordinates keeps
+        #the same pixel selection as before.
+        out = map_coordinates(self._map, (Ypix, Xpix), order=0,
+                              mode="constant", cval=0.0, prefilter=False)
+
+        return K * out
 
     def get_boundaries(self):
     
@@ -739,8 +902,26 @@ class SpatialTemplate_2D(Function2D, metaclass=FunctionMeta):
 
         if isinstance( z, u.Quantity):
             z = z.value
-        return np.multiply(self.K.value,np.ones_like( z ) )
+        return self.K.value * np.ones_like( z )
         
+@lru_cache(maxsize=64)
+def _plaw_sphere_norm(index, maxr, minr):
+    """
+    Normalization integral of the truncated power law on the sphere, cached
+    because it only depends on the (few distinct) parameter values.
+    """
+
+    if maxr <= minr:
+
+        return np.power(_DEG2RAD, 2. + index) * np.pi * maxr ** 2 * minr ** index
+
+    if index == -2.:
+
+        return np.pi * (1.0 + 2. * np.log(maxr / minr))
+
+    return np.power(minr * _DEG2RAD, 2. + index) * np.pi + 2. * np.pi / (2. + index) * (np.power(maxr * _DEG2RAD, index + 2.) - np.power(minr * _DEG2RAD, index + 2.))
+
+
 class Power_law_on_sphere(Function2D, metaclass=FunctionMeta):        
 
     r"""
@@ -803,18 +984,41 @@ class Power_law_on_sphere(Function2D, metaclass=FunctionMeta):
 
         lon, lat = x,y
 
-        angsep = angular_distance(lon0, lat0, lon, lat)
+        norm = _plaw_sphere_norm(float(getattr(index, "value", index)),
+                                 float(getattr(maxr, "value", maxr)),
+                                 float(getattr(minr, "value", minr)))
 
-        if maxr <= minr:
-            norm = np.power(np.pi / 180., 2.+index) * np.pi * maxr**2 * minr**index
-        elif self.index.value == -2.:
-            norm = np.pi * (1.0 + 2. * np.log(maxr / minr) )
-        else:
-            norm = np.power(minr * np.pi / 180., 2.+index) * np.pi + 2. * np.pi / (2.+index) * (np.power(maxr * np.pi / 180., index+2.) - np.power(minr * np.pi / 180., index+2.))
+        if not isinstance(x, u.Quantity):
+
+            lon = _as_float_array(x)
+            lat = _as_float_array(y)
+
+            # normalization folded into the kernel prefactor, so the kernel
+            # writes the final value in its single pass
+
+            pref = np.power(_DEG2RAD, index) / norm
+
+            return nb_func.plaw_on_sphere_eval(
+                lon.ravel(), lat.ravel(), lon0, lat0, index, maxr, minr, pref
+            ).reshape(lon.shape)
+
+        # The cached norm is a plain float, so the units path computes in
+        # stripped degree values and attaches the deg**-2 of the result
+        # explicitly (the baseline Quantity norm used to cancel the
+        # deg**index of value down to deg**-2)
+
+        index_v = float(getattr(index, "value", index))
+        maxr_v = float(getattr(maxr, "value", maxr))
+        minr_v = float(getattr(minr, "value", minr))
+
+        angsep = angular_distance(getattr(lon0, "value", lon0),
+                                  getattr(lat0, "value", lat0),
+                                  lon.to(u.degree).value,
+                                  lat.to(u.degree).value)
 
-        value = np.less_equal(angsep,maxr) * np.power(np.pi / 180., index) * np.power(np.add(np.multiply(angsep, np.greater(angsep, minr)), np.multiply(minr, np.less_equal(angsep, minr))), index)
+        value = np.less_equal(angsep, maxr_v) * np.power(_DEG2RAD, index_v) * np.power(np.maximum(angsep, minr_v), index_v)
 
-        return value / norm
+        return value / norm * (u.degree ** -2)
 
     def get_boundaries(self):
 
@@ -4,6 +4,8 @@ import math
 import numba as nb
 import numpy as np
 
+LN10 = math.log(10.0)
+
 # from numba.extending import get_cython_function_address
 
 # addr1 = get_cython_function_address(
@@ -27,6 +29,12 @@ import numpy as np
 #     return gamma_fn(x)
 
 
+# Arrays at least this large are worth dispatching to the parallel kernel
+# variants; below this threshold the thread start-up cost dominates
+
+PARALLEL_THRESHOLD = 50000
+
+
 @nb.njit(fastmath=True, cache=True)
 def plaw_eval(x, K, index, piv):
 
@@ -40,15 +48,146 @@ def plaw_eval(x, K, index, piv):
     return out
 
 
+@nb.njit(fastmath=True, cache=True, error_model="numpy")
+def plaw_int_eval(x, K, k, piv):
+
+    # Power law with a small integer index, computed with multiplications
+    # (and at most one division) instead of the much slower generic pow.
+    # Integer indices come up all the time as starting points and limits
+    # during fits. The numpy error model keeps x == 0 with a negative
+    # index at inf, like the pow-based kernels, instead of raising.
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    ak = abs(k)
+
+    for idx in range(n):
+
+        r = x[idx] / piv
+
+        if ak == 0:
+
+            v = 1.0
+
+        elif ak == 1:
+
+            v = r
+
+        elif ak == 2:
+
+            v = r * r
+
+        else:
+
+            v = r * r * r
+
+        if k < 0:
+
+            v = 1.0 / v
+
+        out[idx] = K * v
+
+    return out
+
+
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def plaw_eval_par(x, K, index, piv):
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    for idx in nb.prange(n):
+
+        out[idx] = K * math.pow(x[idx] / piv, index)
+
+    return out
+
+
+@nb.guvectorize(
+    ["(float64[:], float64, float64, float64, float64[:])"],
+    "(n),(),(),()->(n)",
+    cache=True,
+)
+def plaw_eval_gu(x, K, index, piv, out):
+    """
+    guvectorize version of plaw_eval. Callers which evaluate over a fixed
+    grid can pass a preallocated array through the out keyword to avoid
+    one allocation per call, and the gufunc broadcasting also allows
+    arrays of K/index/piv (e.g. one power law per row in a joint fit).
+    """
+
+    for idx in range(x.shape[0]):
+
+        out[idx] = K * math.pow(x[idx] / piv, index)
+
+
+@nb.njit(fastmath=True, cache=True)
+def plaw_flux_eval(x, F, index, a, b):
+
+    gp1 = index + 1.0
+
+    # The scalar normalization is computed once, outside of the loop
+
+    norm = F * gp1 / (b ** gp1 - a ** gp1)
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    for idx in range(n):
+
+        out[idx] = norm * x[idx] ** index
+
+    return out
+
+
 @nb.njit(fastmath=True, cache=True)
 def cplaw_eval(x, K, xc, index, piv):
 
     n = x.shape[0]
     out = np.empty(n)
 
+    inv_xc = 1.0 / xc
+
     for i in range(n):
         # Compute it in logarithm to avoid roundoff errors, then raise it
-        log_v = index * np.log(x[i] / piv) - (x[i] / xc)
+        log_v = index * np.log(x[i] / piv) - x[i] * inv_xc
+        out[i] = K * np.exp(log_v)
+
+    return out
+
+
+@nb.njit(fastmath=True, cache=True)
+def cplaw_eval_logx(x, logx, K, xc, index, piv):
+
+    # Same as cplaw_eval, but reusing a precomputed log(x) so the
+    # transcendental is shared between the components of a composite model
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    log_piv = np.log(piv)
+    inv_xc = 1.0 / xc
+
+    for i in range(n):
+
+        log_v = index * (logx[i] - log_piv) - x[i] * inv_xc
+        out[i] = K * np.exp(log_v)
+
+    return out
+
+
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def cplaw_eval_par(x, K, xc, index, piv):
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    inv_xc = 1.0 / xc
+
+    for i in nb.prange(n):
+
+        log_v = index * np.log(x[i] / piv) - x[i] * inv_xc
         out[i] = K * np.exp(log_v)
 
     return out
@@ -68,17 +207,62 @@ def cplaw_inverse_eval(x, K, b, index, piv):
     return out
 
 
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def cplaw_inverse_eval_par(x, K, b, index, piv):
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    for i in nb.prange(n):
+
+        log_v = index * np.log(x[i] / piv) - x[i] * b
+        out[i] = K * np.exp(log_v)
+
+    return out
+
+
 @nb.njit(fastmath=True, cache=True)
-def super_cplaw_eval(x, K, piv, index, xc, gamma):
+def scplaw_eval(x, K, xc, index, gamma, piv):
 
     n = x.shape[0]
     out = np.empty(n)
 
+    log_piv = math.log(piv)
+    log_xc = math.log(xc)
+
     for i in range(n):
 
-        log_v = index * np.log(x[i] / piv) - gamma*(x[i] / xc)
+        # x is strictly positive (it is an energy), so the powers can be
+        # computed as exp(y*log(x)), which is faster than the generic pow
 
-        out[i] = K * np.exp(log_v)
+        lx = math.log(x[i])
+
+        out[i] = K * math.exp(
+            index * (lx - log_piv) - math.exp(gamma * (lx - log_xc))
+        )
+
+    return out
+
+
+@nb.njit(fastmath=True, cache=True)
+def scplaw_eval_logx(x, logx, K, xc, index, gamma, piv):
+
+    # Same as scplaw_eval, but reusing a precomputed log(x) so the
+    # transcendental is shared between the components of a composite model
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    log_piv = np.log(piv)
+    log_xc = np.log(xc)
+
+    for i in range(n):
+
+        lx = logx[i]
+
+        out[i] = K * math.exp(
+            index * (lx - log_piv) - math.exp(gamma * (lx - log_xc))
+        )
 
     return out
 
@@ -94,14 +278,47 @@ def band_eval(x, K, alpha, beta, E0, piv):
     factor_ab = np.exp(beta - alpha) * \
         math.pow(break_point / piv, alpha - beta)
 
+    K_ab = K * factor_ab
+
+    neg_inv_E0 = -1.0 / E0
+
     for idx in range(n):
 
         if x[idx] < break_point:
-            out[idx] = K * math.pow(x[idx] / piv, alpha) * np.exp(-x[idx] / E0)
+            out[idx] = K * \
+                math.pow(x[idx] / piv, alpha) * np.exp(x[idx] * neg_inv_E0)
+
+        else:
+
+            out[idx] = K_ab * math.pow(x[idx] / piv, beta)
+
+    return out
+
+
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def band_eval_par(x, K, alpha, beta, E0, piv):
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    break_point = (alpha - beta) * E0
+
+    factor_ab = np.exp(beta - alpha) * \
+        math.pow(break_point / piv, alpha - beta)
+
+    K_ab = K * factor_ab
+
+    neg_inv_E0 = -1.0 / E0
+
+    for idx in nb.prange(n):
+
+        if x[idx] < break_point:
+            out[idx] = K * \
+                math.pow(x[idx] / piv, alpha) * np.exp(x[idx] * neg_inv_E0)
 
         else:
 
-            out[idx] = K * factor_ab * math.pow(x[idx] / piv, beta)
+            out[idx] = K_ab * math.pow(x[idx] / piv, beta)
 
     return out
 
@@ -112,16 +329,34 @@ def bplaw_eval(x, K, xb, alpha, beta, piv):
     n = x.shape[0]
     out = np.empty(n)
 
-    factor = math.pow(xb / piv, alpha - beta)
+    # Writing both branches as K * (x/xb)**e * (xb/piv)**alpha (with e the
+    # branch index) lets us hoist the pivot term and keep a single exp/log
+    # per element instead of the generic pow
+
+    log_factor = alpha * math.log(xb / piv)
 
     for idx in range(n):
 
-        if x[idx] < xb:
+        e = alpha if x[idx] < xb else beta
+
+        out[idx] = K * math.exp(e * math.log(x[idx] / xb) + log_factor)
+
+    return out
 
-            out[idx] = K * math.pow(x[idx] / piv, alpha)
-        else:
 
-            out[idx] = K * factor * math.pow(x[idx] / piv, beta)
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def bplaw_eval_par(x, K, xb, alpha, beta, piv):
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    log_factor = alpha * math.log(xb / piv)
+
+    for idx in nb.prange(n):
+
+        e = alpha if x[idx] < xb else beta
+
+        out[idx] = K * math.exp(e * math.log(x[idx] / xb) + log_factor)
 
     return out
 
@@ -135,7 +370,12 @@ def sbplaw_eval(x, K, alpha, be, bs, beta, piv):
     B = 0.5 * (alpha + beta)
     M = 0.5 * (beta - alpha)
 
-    arg_piv = np.log10(piv / be) / bs
+    # log10(y)/bs written as log(y) * inv_bs_ln10, so the loop only ever
+    # uses the (vectorizable) natural log and exp
+
+    inv_bs_ln10 = 1.0 / (bs * LN10)
+
+    arg_piv = np.log(piv / be) * inv_bs_ln10
 
     log2 = np.log(2.0)
 
@@ -151,11 +391,9 @@ def sbplaw_eval(x, K, alpha, be, bs, beta, piv):
 
         pcosh_piv = Mbs * np.log((np.exp(arg_piv) + np.exp(-arg_piv)) / 2.0)
 
-    ten_pcosh_piv = math.pow(10., pcosh_piv)
-
     for idx in range(n):
 
-        arg = np.log10(x[idx] / be) / bs
+        arg = np.log(x[idx] / be) * inv_bs_ln10
 
         if arg < -6.0:
 
@@ -170,7 +408,95 @@ def sbplaw_eval(x, K, alpha, be, bs, beta, piv):
             pcosh = Mbs * np.log(0.5 * ((np.exp(arg) + np.exp(-arg))))
 
         out[idx] = K * math.pow(x[idx]/piv, B) * \
-            math.pow(10., pcosh)/ten_pcosh_piv
+            math.exp((pcosh - pcosh_piv) * LN10)
+
+    return out
+
+
+@nb.njit(fastmath=True, cache=True)
+def logpar_eval(x, K, piv, alpha, beta):
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    for i in range(n):
+
+        # r**(alpha - beta*log(r)) is exp((alpha - beta*L)*L) with
+        # L = log(r), which computes the log only once
+
+        L = math.log(x[i] / piv)
+
+        out[i] = K * math.exp((alpha - beta * L) * L)
+
+    return out
+
+
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def logpar_eval_par(x, K, piv, alpha, beta):
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    for i in nb.prange(n):
+
+        L = math.log(x[i] / piv)
+
+        out[i] = K * math.exp((alpha - beta * L) * L)
+
+    return out
+
+
+@nb.njit(fastmath=True, cache=True)
+def expcut_eval(x, K, xc):
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    # Multiply by the reciprocal inside the loop instead of dividing
+
+    inv_neg_xc = -1.0 / xc
+
+    for i in range(n):
+
+        out[i] = K * math.exp(x[i] * inv_neg_xc)
+
+    return out
+
+
+@nb.njit(fastmath=True, cache=True)
+def step_eval(x, lower_bound, upper_bound, value):
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    for idx in range(n):
+
+        if lower_bound <= x[idx] and x[idx] <= upper_bound:
+
+            out[idx] = value
+
+        else:
+
+            out[idx] = 0.0
+
+    return out
+
+
+@nb.njit(fastmath=True, cache=True)
+def step_eval_upper(x, lower_bound, upper_bound, value):
+
+    n = x.shape[0]
+    out = np.empty(n)
+
+    for idx in range(n):
+
+        if lower_bound <= x[idx] and x[idx] < upper_bound:
+
+            out[idx] = value
+
+        else:
+
+            out[idx] = 0.0
 
     return out
 
@@ -184,7 +510,17 @@ def bb_eval(x, K, kT):
     for idx in range(n):
 
         arg = x[idx]/kT
-        out[idx] = K * x[idx] * x[idx] / np.expm1(arg)
+
+        if arg > 700.0:
+
+            # the exponential would overflow, but the function value
+            # is zero to double precision anyway
+
+            out[idx] = 0.0
+
+        else:
+
+            out[idx] = K * x[idx] * x[idx] / np.expm1(arg)
 
     return out
 
@@ -209,7 +545,20 @@ def bb_eval(x, K, kT):
 @nb.njit(fastmath=True, cache=True)
 def ggrb_int_pl(a, b, Ec, Emin, Emax):
 
-    pre = math.pow(a - b, a - b) * math.exp(b - a) / math.pow(Ec, b)
+    d = a - b
+
+    if d > 0.0:
+
+        # d**d computed on the exp/log form, which shares the exp with
+        # the exp(b - a) factor
+
+        pre = math.exp(d * math.log(d) + (b - a)) / math.pow(Ec, b)
+
+    else:
+
+        # a == b gives 0**0 = 1, which pow handles and exp/log does not
+
+        pre = math.pow(d, d) * math.exp(b - a) / math.pow(Ec, b)
 
     if b != -2:
         b2 = 2+b
@@ -229,3 +578,193 @@ def ggrb_int_pl(a, b, Ec, Emin, Emax):
 #     i2 = vec_gammaincc(2 + a, Emax/Ec) * vec_gamma(2 + a)
 
 #     return -Ec * Ec * (i2 - i1)
+
+# 2D functions on the sphere. Coordinates come in and go out in degrees;
+# the distances are haversine, accurate everywhere but at the antipodes,
+# which are never inside these shapes.
+
+DEG2RAD = math.pi / 180.0
+RAD2DEG = 180.0 / math.pi
+
+
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def gauss_on_sphere_eval(lon, lat, lon0, lat0, sigma):
+
+    n = lon.shape[0]
+    out = np.empty(n, dtype=lon.dtype)
+
+    clat0 = math.cos(lat0 * DEG2RAD)
+
+    norm = RAD2DEG * RAD2DEG / (2.0 * math.pi * sigma * sigma)
+
+    neg_half_inv_s2 = -0.5 / (sigma * sigma)
+
+    for i in nb.prange(n):
+
+        sdlat = math.sin(0.5 * (lat[i] - lat0) * DEG2RAD)
+        sdlon = math.sin(0.5 * (lon[i] - lon0) * DEG2RAD)
+
+        a = sdlat * sdlat + clat0 * math.cos(lat[i] * DEG2RAD) * sdlon * sdlon
+
+        if a > 1.0:
+
+            a = 1.0
+
+        angsep = 2.0 * math.asin(math.sqrt(a)) * RAD2DEG
+
+        out[i] = norm * math.exp(neg_half_inv_s2 * angsep * angsep)
+
+    return out
+
+
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def disk_on_sphere_eval(lon, lat, lon0, lat0, radius, norm):
+
+    n = lon.shape[0]
+    out = np.empty(n, dtype=lon.dtype)
+
+    clat0 = math.cos(lat0 * DEG2RAD)
+
+    # the longitude cut is invalid for a disk containing a pole, where
+    # every longitude can be inside
+
+    lon_cut = abs(lat0) + radius < 90.0
+
+    for i in nb.prange(n):
+
+        # cheap bounding-box rejection before any trigonometry
+
+        dlat = abs(lat[i] - lat0)
+
+        if dlat > radius:
+
+            out[i] = 0.0
+            continue
+
+        dlon = abs(abs(lon[i] - lon0) % 360.0 - 180.0)
+        dlon = 180.0 - dlon
+
+        if lon_cut and dlon * clat0 > radius + dlat:
+
+            out[i] = 0.0
+            continue
+
+        sdlat = math.sin(0.5 * dlat * DEG2RAD)
+        sdlon = math.sin(0.5 * dlon * DEG2RAD)
+
+        a = sdlat * sdlat + clat0 * math.cos(lat[i] * DEG2RAD) * sdlon * sdlon
+
+        if a > 1.0:
+
+            a = 1.0
+
+        angsep = 2.0 * math.asin(math.sqrt(a)) * RAD2DEG
+
+        out[i] = norm if angsep <= radius else 0.0
+
+    return out
+
+
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def ellipse_on_sphere_eval(lon, lat, lon1, lat1, lon2, lat2, two_a, norm):
+
+    n = lon.shape[0]
+    out = np.empty(n, dtype=lon.dtype)
+
+    lon1r = lon1 * DEG2RAD
+    lat1r = lat1 * DEG2RAD
+    lon2r = lon2 * DEG2RAD
+    lat2r = lat2 * DEG2RAD
+
+    clat1 = math.cos(lat1r)
+    clat2 = math.cos(lat2r)
+
+    for i in nb.prange(n):
+
+        lonr = lon[i] * DEG2RAD
+        latr = lat[i] * DEG2RAD
+
+        # one cos of the query point shared by both focal distances
+
+        clat = math.cos(latr)
+
+        sdlat = math.sin(0.5 * (latr - lat1r))
+        sdlon = math.sin(0.5 * (lonr - lon1r))
+
+        a1 = sdlat * sdlat + clat1 * clat * sdlon * sdlon
+
+        if a1 > 1.0:
+
+            a1 = 1.0
+
+        sdlat = math.sin(0.5 * (latr - lat2r))
+        sdlon = math.sin(0.5 * (lonr - lon2r))
+
+        a2 = sdlat * sdlat + clat2 * clat * sdlon * sdlon
+
+        if a2 > 1.0:
+
+            a2 = 1.0
+
+        angsep = 2.0 * RAD2DEG * (
+            math.asin(math.sqrt(a1)) + math.asin(math.sqrt(a2))
+        )
+
+        out[i] = norm if angsep <= two_a else 0.0
+
+    return out
+
+
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def plaw_on_sphere_eval(lon, lat, lon0, lat0, index, maxr, minr, pref):
+
+    n = lon.shape[0]
+    out = np.empty(n, dtype=lon.dtype)
+
+    clat0 = math.cos(lat0 * DEG2RAD)
+
+    # the longitude cut is invalid when the truncation circle contains a
+    # pole, where every longitude can be inside
+
+    lon_cut = abs(lat0) + maxr < 90.0
+
+    for i in nb.prange(n):
+
+        # cheap bounding-box rejection before any trigonometry
+
+        dlat = abs(lat[i] - lat0)
+
+        if dlat > maxr:
+
+            out[i] = 0.0
+            continue
+
+        dlon = 180.0 - abs(abs(lon[i] - lon0) % 360.0 - 180.0)
+
+        if lon_cut and dlon * clat0 > maxr + dlat:
+
+            out[i] = 0.0
+            continue
+
+        sdlat = math.sin(0.5 * dlat * DEG2RAD)
+        sdlon = math.sin(0.5 * dlon * DEG2RAD)
+
+        a = sdlat * sdlat + clat0 * math.cos(lat[i] * DEG2RAD) * sdlon * sdlon
+
+        if a > 1.0:
+
+            a = 1.0
+
+        angsep = 2.0 * math.asin(math.sqrt(a)) * RAD2DEG
+
+        if angsep > maxr:
+
+            out[i] = 0.0
+
+        else:
+
+            r = angsep if angsep > minr else minr
+
+            out[i] = pref * math.pow(r, index)
+
+    return out
@@ -0,0 +1,127 @@
+from __future__ import division
+
+import numpy as np
+import pytest
+
+import astromodels.functions.numba_functions as nb_func
+from astromodels.functions.functions_2D import Ellipse_on_sphere
+from astromodels.utils.angular_distance import angular_distance
+
+try:
+
+    from astromodels.functions.functions import EBLattenuation
+
+except:
+
+    has_ebl = False
+
+else:
+
+    has_ebl = True
+
+__author__ = 'henrikef'
+
+
+def test_plaw_eval_gu_matches_plaw_eval():
+
+    # The guvectorize power law must return the same values as the plain
+    # kernel, both when allocating its output and when writing into a
+    # caller-provided buffer
+
+    x = np.logspace(0, 3, 100)
+
+    K, index, piv = 2.3, -1.7, 10.0
+
+    expected = nb_func.plaw_eval(x, K, index, piv)
+
+    result = nb_func.plaw_eval_gu(x, K, index, piv)
+
+    np.testing.assert_allclose(result, expected, rtol=1e-14)
+
+    out = np.empty_like(x)
+
+    nb_func.plaw_eval_gu(x, K, index, piv, out)
+
+    np.testing.assert_allclose(out, expected, rtol=1e-14)
+
+
+def test_ellipse_planar_approx_matches_exact():
+
+    # For a small ellipse away from the poles the opt-in planar fast path
+    # must agree with the exact great-circle membership test everywhere
+    # except within a thin sliver around the boundary, and return the same
+    # normalization for the pixels inside
+
+    ellipse = Ellipse_on_sphere()
+
+    ellipse.lon0 = 30.0
+    ellipse.lat0 = 10.0
+    ellipse.a = 0.4
+    ellipse.e = 0.6
+    ellipse.theta = 20.0
+
+    lon, lat = np.meshgrid(np.linspace(29.0, 31.0, 201),
+                           np.linspace(9.0, 11.0, 201))
+    lon = lon.ravel()
+    lat = lat.ravel()
+
+    exact = ellipse(lon, lat)
+
+    ellipse.use_planar_approx = True
+
+    approx = ellipse(lon, lat)
+
+    # pixels whose summed focal distance is within the approximation error
+    # of the boundary are allowed to land on either side
+
+    b = ellipse.a.value * np.sqrt(1.0 - ellipse.e.value ** 2)
+
+    d1 = angular_distance(ellipse.lon1, ellipse.lat1, lon, lat)
+    d2 = angular_distance(ellipse.lon2, ellipse.lat2, lon, lat)
+
+    away_from_boundary = np.abs((d1 + d2) - 2.0 * ellipse.a.value) > 1e-2
+
+    np.testing.assert_array_equal(exact[away_from_boundary],
+                                  approx[away_from_boundary])
+
+    inside = exact > 0
+
+    assert np.any(inside)
+
+    expected_norm = (180.0 / np.pi) ** 2 / (np.pi * ellipse.a.value * b)
+
+    np.testing.assert_allclose(exact[inside], expected_norm, rtol=1e-10)
+    np.testing.assert_allclose(approx[approx > 0], expected_norm, rtol=1e-10)
+
+
+@pytest.mark.skipif(not has_ebl, reason="ebltable not available")
+def test_eblattenuation_evaluate_batch_matches_evaluate():
+
+    # evaluate_batch must return exactly what N independent evaluate calls
+    # return, in the same order and with the same shapes
+
+    ebl = EBLattenuation()
+
+    energies = [np.logspace(5, 8, 50),
+                np.logspace(5.5, 7.5, 31),
+                np.logspace(6, 8, 17)]
+
+    redshifts = [0.1, 0.5, 1.0]
+
+    singles = []
+
+    for x, z in zip(energies, redshifts):
+
+        ebl.redshift.value = z
+
+        singles.append(ebl(x))
+
+    batch = ebl.evaluate_batch(energies, redshifts)
+
+    assert len(batch) == len(energies)
+
+    for computed, expected in zip(batch, singles):
+
+        assert computed.shape == expected.shape
+
+        np.testing.assert_allclose(computed, expected, rtol=1e-12)
@@ -0,0 +1,33 @@
+import numpy as np
+
+
+def sky_bounding_box(lon0, lat0, max_radius):
+    """
+    Returns the bounding box in (longitude, latitude) of a circle of radius max_radius centered on (lon0, lat0), shared by the get_boundaries methods of the on-sphere functions.
+
+    The latitude range is clipped to the poles and the longitude extent is widened by 1/cos(lat) at the most extreme latitude covered, so the box always contains the circle. Near the poles, or when the widened extent wraps around the sphere, the full longitude range is returned.
+
+    Note: All parameters are assumed to be given in DEGREES
+    :param lon0: float, longitude of the center
+    :param lat0: float, latitude of the center
+    :param max_radius: float, angular radius of the region to enclose
+    :return: ((min_lon, max_lon), (min_lat, max_lat)) in degrees, longitudes wrapped to [0, 360)
+    """
+
+    min_lat = max(-90., lat0 - max_radius)
+    max_lat = min(90., lat0 + max_radius)
+
+    max_abs_lat = max(abs(min_lat), abs(max_lat))
+
+    cos_max_abs_lat = np.cos(np.deg2rad(max_abs_lat))
+
+    if max_abs_lat > 89. or max_radius / cos_max_abs_lat >= 180.:
+
+        return (0., 360.), (min_lat, max_lat)
+
+    lon_extent = max_radius / cos_max_abs_lat
+
+    min_lon = (lon0 - lon_extent) % 360.
+    max_lon = (lon0 + lon_extent) % 360.
+
+    return (min_lon, max_lon), (min_lat, max_lat)